@@ -2,7 +2,11 @@
 """
 Demo script for PocketgroqPKE - Procedural Knowledge Extractor.
 Demonstrates extraction of procedures from text and RDF generation.
+
+Run without arguments for the interactive menu, or use --all to extract
+every built-in example concurrently (handy for timing runs).
 """
+import argparse
 import asyncio
 import os
 import sys
@@ -41,7 +45,74 @@ EXAMPLES = {
     """
 }
 
+def parse_args() -> argparse.Namespace:
+    """Parse command-line options; with none given the demo runs interactively."""
+    parser = argparse.ArgumentParser(description="PocketgroqPKE demo")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--all", action="store_true", help="Run every built-in example concurrently")
+    group.add_argument("--example", choices=list(EXAMPLES), help="Run a single built-in example")
+    group.add_argument("--file", help="Load a procedure from a PDF or TXT file")
+    return parser.parse_args()
+
+def show_procedure(extractor: ProceduralExtractor, procedure):
+    """Print an extracted procedure and its RDF, then save the RDF and visualization."""
+    print("\nExtracted Procedure:")
+    print(f"Title: {procedure.title}\n")
+    
+    for i, step in enumerate(procedure.steps, 1):
+        print(f"Step {i}: {step.text}")
+        print(f"  Actions: {', '.join(step.actions)}")
+        print(f"  Objects: {', '.join(step.direct_objects)}")
+        print(f"  Equipment: {', '.join(step.equipment)}")
+        if step.time_info:
+            print(f"  Time: {step.time_info}")
+        print()
+        
+    # Generate and display RDF
+    print("Generated RDF Knowledge Graph:")
+    print("-" * 60)
+    kg = extractor.generate_kg(procedure)
+    print(kg)
+    print("-" * 60)
+
+    # Save both RDF and visualization
+    rdf_path = extractor.save_kg(procedure)
+    viz_path = extractor.visualize(procedure)
+    
+    print(f"\nFiles saved:")
+    print(f"- Knowledge graph (TTL): {rdf_path}")
+    print(f"- Visualization (PDF): {viz_path}")
+
+async def run_all(extractor: ProceduralExtractor):
+    """Extract every built-in example concurrently and report them in order."""
+    names = list(EXAMPLES)
+    print(f"Processing {len(names)} examples concurrently...")
+    procedures = await asyncio.gather(*[extractor.extract_procedure(EXAMPLES[name]) for name in names])
+    for name, procedure in zip(names, procedures):
+        print("=" * 60)
+        print(f"Example: {name}")
+        show_procedure(extractor, procedure)
+
+async def extract_file(extractor: ProceduralExtractor, filepath: str):
+    """Extract a procedure from a PDF or TXT file."""
+    print(f"\nProcessing file: {filepath}")
+    print("-" * 60)
+    procedure = await extractor.extract_procedure_from_file(filepath)
+    print(f"Extracted procedure from: {Path(filepath).name}")
+    print("-" * 60)
+    return procedure
+
+async def extract_text(extractor: ProceduralExtractor, text: str):
+    """Extract a procedure from text, echoing the input first."""
+    print("\nProcessing text...")
+    print("-" * 60)
+    print(text.strip())
+    print("-" * 60)
+    return await extractor.extract_procedure(text)
+
 async def main():
+    args = parse_args()
+
     # Check for API key
     if not os.getenv("GROQ_API_KEY"):
         print("Error: GROQ_API_KEY environment variable not set")
@@ -52,7 +123,24 @@ async def main():
     groq = GroqProvider()
     extractor = ProceduralExtractor(groq)
     
-    # Let user choose an example
+    try:
+        if args.all:
+            await run_all(extractor)
+            return
+        if args.file:
+            procedure = await extract_file(extractor, args.file)
+        elif args.example:
+            procedure = await extract_text(extractor, EXAMPLES[args.example])
+        else:
+            procedure = await run_interactive(extractor)
+        show_procedure(extractor, procedure)
+        
+    except Exception as e:
+        print(f"\nError during processing: {e}")
+        sys.exit(1)
+
+async def run_interactive(extractor: ProceduralExtractor):
+    """Let the user pick an example, enter text or load a file."""
     print("Available examples:")
     for i, (name, _) in enumerate(EXAMPLES.items(), 1):
         print(f"{i}. {name}")
@@ -62,75 +150,23 @@ async def main():
     
     choice = input("\nSelect an option (0-3 or F): ").strip().upper()
     
-    try:
-        # Handle file input
-        if choice == "F":
-            filepath = input("\nEnter file path: ").strip()
-            print(f"\nProcessing file: {filepath}")
-            print("-" * 60)
-            procedure = await extractor.extract_procedure_from_file(filepath)
-            print(f"Extracted procedure from: {Path(filepath).name}")
-            print("-" * 60)
-            
-        # Handle text input    
-        else:
-            if choice == "0":
-                print("\nEnter your procedure text (end with two blank lines):")
-                lines = []
-                empty_lines = 0
-                while empty_lines < 2:
-                    line = input()
-                    if not line:
-                        empty_lines += 1
-                    else:
-                        empty_lines = 0
-                    lines.append(line)
-                text = "\n".join(lines[:-2])  # Remove final empty lines
-            else:
-                try:
-                    text = list(EXAMPLES.values())[int(choice)-1]
-                except (IndexError, ValueError):
-                    print("Invalid choice. Using coffee example.")
-                    text = EXAMPLES["coffee"]
-            
-            print("\nProcessing text...")
-            print("-" * 60)
-            print(text.strip())
-            print("-" * 60)
-            
-            procedure = await extractor.extract_procedure(text)
-        
-        # Display extracted information
-        print("\nExtracted Procedure:")
-        print(f"Title: {procedure.title}\n")
+    # Handle file input
+    if choice == "F":
+        filepath = input("\nEnter file path: ").strip()
+        return await extract_file(extractor, filepath)
         
-        for i, step in enumerate(procedure.steps, 1):
-            print(f"Step {i}: {step.text}")
-            print(f"  Actions: {', '.join(step.actions)}")
-            print(f"  Objects: {', '.join(step.direct_objects)}")
-            print(f"  Equipment: {', '.join(step.equipment)}")
-            if step.time_info:
-                print(f"  Time: {step.time_info}")
-            print()
-            
-        # Generate and display RDF
-        print("Generated RDF Knowledge Graph:")
-        print("-" * 60)
-        kg = extractor.generate_kg(procedure)
-        print(kg)
-        print("-" * 60)
-
-        # Save both RDF and visualization
-        rdf_path = extractor.save_kg(procedure)
-        viz_path = extractor.visualize(procedure)
-        
-        print(f"\nFiles saved:")
-        print(f"- Knowledge graph (TTL): {rdf_path}")
-        print(f"- Visualization (PDF): {viz_path}")
-        
-    except Exception as e:
-        print(f"\nError during processing: {e}")
-        sys.exit(1)
+    # Handle text input    
+    if choice == "0":
+        print("\nEnter your procedure text, then press Ctrl-D (Ctrl-Z then Enter on Windows):")
+        text = sys.stdin.read().strip()
+    else:
+        try:
+            text = list(EXAMPLES.values())[int(choice)-1]
+        except (IndexError, ValueError):
+            print("Invalid choice. Using coffee example.")
+            text = EXAMPLES["coffee"]
+    
+    return await extract_text(extractor, text)
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
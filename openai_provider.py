@@ -1,12 +1,118 @@
+import asyncio
+import functools
+import hashlib
 import json
 import logging
 import os
-from collections import defaultdict
-from typing import Dict, List, Union, Optional, Any, Callable, Generator
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Tuple, Union, Optional, Any, Callable, Generator, AsyncGenerator
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
+from tenacity import AsyncRetrying, retry_if_exception, stop_after_attempt, wait_exponential_jitter
+from urllib3.exceptions import InvalidHeader
+from urllib3.util.retry import Retry
+
+# orjson is optional; fall back to the stdlib json module when it is not installed
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
 
 logger = logging.getLogger(__name__)
 
+_SSE_DONE = b"[DONE]"
+
+# Upper bound on threads used to run distinct tool calls concurrently
+_MAX_TOOL_WORKERS = 8
+
+# Rate limits, timeouts and transient server errors are retried with backoff
+_RETRY_STATUSES = frozenset([408, 409, 425, 429, 500, 502, 503, 504])
+# Retries after the first attempt, for both the sync and async paths
+_MAX_RETRIES = 5
+
+# Retry policy of the sync session; its Retry-After parsing is shared with the async path
+_SYNC_RETRY = Retry(
+    total=_MAX_RETRIES,
+    backoff_factor=0.5,
+    backoff_jitter=0.3,
+    status_forcelist=_RETRY_STATUSES,
+    allowed_methods=frozenset(["POST", "GET"]),
+    respect_retry_after_header=True,
+    raise_on_status=False  # let raise_for_status report the final response
+)
+
+# Backoff used by the async path when the server sends no Retry-After header
+_async_backoff = wait_exponential_jitter(multiplier=0.5, max=30)
+
+def _is_retryable(exc: BaseException) -> bool:
+    """Return whether an httpx error is transient and worth retrying."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in _RETRY_STATUSES
+    return isinstance(exc, httpx.TransportError)
+
+def _retry_after(exc: BaseException) -> Optional[float]:
+    """Return the delay in seconds requested by a Retry-After header, parsed as urllib3 does for the sync path."""
+    if not isinstance(exc, httpx.HTTPStatusError) or exc.response.status_code not in Retry.RETRY_AFTER_STATUS_CODES:
+        return None
+    value = exc.response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return _SYNC_RETRY.parse_retry_after(value)
+    except InvalidHeader:
+        return None
+
+def _async_retry_wait(retry_state) -> float:
+    """Wait as long as the server's Retry-After asks, falling back to exponential backoff."""
+    delay = _retry_after(retry_state.outcome.exception())
+    return delay if delay is not None else _async_backoff(retry_state)
+
+@functools.lru_cache(maxsize=128)
+def _request_template(model: str, temperature: float, max_tokens: int, top_p: float,
+                      presence_penalty: Optional[float], frequency_penalty: Optional[float], json_mode: bool,
+                      tools_json: Optional[bytes], tool_choice_json: Optional[bytes],
+                      stream: bool) -> Tuple[Mapping[str, Any], bytes]:
+    """
+    Build the static (non-message) part of a chat completion request.
+
+    Returns:
+        The parameters as a read-only mapping, and their JSON encoding as an open
+        object to which only the serialized messages and a closing brace are appended.
+    """
+    template = {
+        "model": model,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "top_p": top_p
+    }
+
+    if stream:
+        template["stream"] = True
+
+    if presence_penalty is not None:
+        template["presence_penalty"] = presence_penalty
+
+    if frequency_penalty is not None:
+        template["frequency_penalty"] = frequency_penalty
+
+    if json_mode:
+        template["response_format"] = {"type": "json_object"}
+
+    if tools_json is not None:
+        template["tools"] = _json_loads(tools_json)
+        template["tool_choice"] = _json_loads(tool_choice_json)
+
+    prefix = _json_dumps(template)[:-1] + b',"messages":'
+    return MappingProxyType(template), prefix
+
 class OpenAIAPIKeyMissingError(Exception):
     """Raised when the OpenAI API key is missing."""
     pass
@@ -15,60 +121,165 @@ class OpenAIAPIError(Exception):
     """Raised when there's an error with the OpenAI API call."""
     pass
 
+class _SSEDecoder:
+    """Incrementally split a server-sent event byte stream into `data:` payloads."""
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def feed(self, chunk: bytes) -> List[bytes]:
+        """Add raw bytes to the buffer and return the payloads of all completed events."""
+        buffer = self._buffer
+        buffer += chunk
+        if b"\r" in buffer:
+            buffer = self._buffer = bytearray(buffer.replace(b"\r\n", b"\n"))
+
+        payloads = []
+        start = 0
+        end = buffer.find(b"\n\n")
+        while end != -1:
+            for line in bytes(buffer[start:end]).split(b"\n"):
+                if line[:6] == b"data: ":
+                    payloads.append(line[6:])
+                elif line[:5] == b"data:":
+                    payloads.append(line[5:])
+            start = end + 2
+            end = buffer.find(b"\n\n", start)
+        if start:
+            del buffer[:start]
+        return payloads
+
 class OpenAIProvider:
-    def __init__(self, api_key: str = None, base_url: str = None):
+    def __init__(self, api_key: str = None, base_url: str = None, history_turns: int = 32, max_sessions: int = 1024,
+                 response_cache_size: int = 256, default_temperature: float = 0.7):
         """
         Initialize the OpenAI-compatible provider.
 
         Args:
             api_key (str, optional): The API key for authentication.
             base_url (str, optional): The base URL for the API endpoint.
+            history_turns (int, optional): Number of user/assistant turns kept per session.
+            max_sessions (int, optional): Number of sessions kept before the least recently used is evicted.
+            response_cache_size (int, optional): Number of deterministic (temperature 0, non-streaming)
+                responses kept in memory. 0 disables the cache.
+            default_temperature (float, optional): Sampling temperature used when a call does not set one.
         """
         self.api_key = api_key or os.environ.get("OPENAI_API_KEY")
         if not self.api_key:
             raise OpenAIAPIKeyMissingError("OpenAI API key is not provided")
-        
-        self.base_url = base_url or os.environ.get("OPENAI_BASE_URL") or "https://api.openai.com/v1"
-        self.conversation_sessions = defaultdict(list)
-        self.tools = {}
+
+        self.default_temperature = default_temperature
+        self._response_cache_size = response_cache_size
+        self._response_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._cache_generation = 0
+        self.set_base_url(base_url or os.environ.get("OPENAI_BASE_URL") or "https://api.openai.com/v1")
+        self._build_headers()
+        self._history_turns = history_turns
+        self._max_sessions = max_sessions
+        self.conversation_sessions: "OrderedDict[str, deque]" = OrderedDict()
+        self.tools: Dict[str, Tuple[Callable, Optional[Callable]]] = {}
+        self._session = self._create_session()
+        self._aclient: Optional[httpx.AsyncClient] = None
+        self._aclient_loop: Optional[asyncio.AbstractEventLoop] = None
 
     def set_api_key(self, api_key: str):
         """Update the API key."""
         self.api_key = api_key
+        self._build_headers()
+        self._cache_generation += 1
 
     def set_base_url(self, base_url: str):
         """Update the base URL for the API endpoint."""
         self.base_url = base_url
+        self._completions_url = f"{base_url}/chat/completions"
+        self._models_url = f"{base_url}/models"
+        self._cache_generation += 1
+
+    def _create_session(self) -> requests.Session:
+        """Create a pooled HTTP session that keeps connections alive between calls."""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=32,
+            max_retries=_SYNC_RETRY
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
 
     def get_available_models(self) -> List[Dict[str, Any]]:
         """Fetch available models from the API provider."""
-        url = f"{self.base_url}/models"
         headers = self._get_headers()
         try:
-            response = requests.get(url, headers=headers)
+            response = self._session.get(self._models_url, headers=headers)
             response.raise_for_status()
-            return response.json().get("data", [])
-        except requests.RequestException as e:
+            return _json_loads(response.content).get("data", [])
+        except (requests.RequestException, json.JSONDecodeError) as e:
             logger.error(f"Failed to fetch models: {e}")
             raise OpenAIAPIError(f"Failed to fetch models: {e}")
 
-    def _get_headers(self) -> Dict[str, str]:
-        """Get headers for API requests."""
-        return {
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """
+        Lazily create the pooled async HTTP client.
+
+        The client's connections belong to the event loop that created it, so a new
+        client is created when called from a different loop (e.g. a second asyncio.run()).
+        """
+        loop = asyncio.get_running_loop()
+        if self._aclient is None or self._aclient.is_closed or self._aclient_loop is not loop:
+            # A client left behind by another loop cannot be closed from this one;
+            # its connections are dropped along with it
+            self._aclient = httpx.AsyncClient(
+                timeout=httpx.Timeout(60.0),
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=32)
+            )
+            self._aclient_loop = loop
+        return self._aclient
+
+    async def aclose(self):
+        """Close the async HTTP client, if one was created on the running event loop."""
+        if self._aclient is not None:
+            if self._aclient_loop is asyncio.get_running_loop():
+                await self._aclient.aclose()
+            self._aclient = None
+            self._aclient_loop = None
+
+    def _build_headers(self):
+        """Prebuild the JSON and event-stream request headers for the current API key."""
+        base_headers = {
             "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-            "Accept": "text/event-stream" if self.stream else "application/json"
+            "Content-Type": "application/json"
         }
+        self._headers_json = {**base_headers, "Accept": "application/json"}
+        self._headers_sse = {**base_headers, "Accept": "text/event-stream"}
 
-    def register_tool(self, name: str, func: Callable):
-        """Register a tool for function calling."""
-        self.tools[name] = func
+    def _get_headers(self, stream: bool = False) -> Dict[str, str]:
+        """Get headers for API requests."""
+        return self._headers_sse if stream else self._headers_json
+
+    def register_tool(self, name: str, func: Callable, schema: Optional[Dict[str, Any]] = None):
+        """
+        Register a tool for function calling.
+
+        Args:
+            name (str): The function name the model uses to call the tool.
+            func (Callable): The function (or coroutine function) to execute.
+            schema (Optional[Dict[str, Any]]): JSON schema for the tool's arguments, e.g. the
+                `parameters` of its tool definition. Arguments are validated against it before
+                the tool is called.
+        """
+        validator = None
+        if schema is not None:
+            import fastjsonschema
+            validator = fastjsonschema.compile(schema)
+        self.tools[name] = (func, validator)
 
     def start_conversation(self, session_id: str):
         """Initialize a new conversation session."""
         if session_id in self.conversation_sessions:
             logger.warning(f"Session '{session_id}' already exists. Overwriting.")
-        self.conversation_sessions[session_id] = []
+        self.conversation_sessions[session_id] = self._new_history()
+        self._touch(session_id)
         logger.info(f"Started new conversation session '{session_id}'.")
 
     def reset_conversation(self, session_id: str):
@@ -81,80 +292,150 @@ class OpenAIProvider:
 
     def get_conversation_history(self, session_id: str) -> List[Dict[str, str]]:
         """Retrieve conversation history for a session."""
-        return self.conversation_sessions.get(session_id, [])
+        return list(self.conversation_sessions.get(session_id, ()))
+
+    def _new_history(self) -> deque:
+        """Create an empty, bounded message history."""
+        return deque(maxlen=2 * self._history_turns)
+
+    def _touch(self, session_id: str) -> deque:
+        """Mark a session as most recently used, creating it if needed, and evict idle sessions."""
+        sessions = self.conversation_sessions
+        if session_id in sessions:
+            sessions.move_to_end(session_id)
+        else:
+            sessions[session_id] = self._new_history()
+        while len(sessions) > self._max_sessions:
+            evicted, _ = sessions.popitem(last=False)
+            logger.info(f"Evicted idle conversation session '{evicted}'.")
+        return sessions[session_id]
 
-    def generate(self, prompt: str, session_id: Optional[str] = None, **kwargs) -> Union[str, Generator[str, None, None]]:
+    def generate(self, prompt: str, session_id: Optional[str] = None, stream: bool = False, **kwargs) -> Union[str, Generator[str, None, None]]:
         """
         Generate a response using the language model.
 
         Args:
             prompt (str): The input prompt.
             session_id (Optional[str]): The session ID for conversation tracking.
-            **kwargs: Additional parameters for the API call.
+            stream (bool): Whether to stream the response as it is generated.
+            **kwargs: Additional parameters for the API call. Pass `structured=True`
+                for a deterministic JSON response (JSON mode at temperature 0).
 
         Returns:
             Union[str, Generator[str, None, None]]: The generated response.
         """
-        self.stream = kwargs.get('stream', False)
         if session_id:
-            messages = self.conversation_sessions[session_id]
-            messages.append({"role": "user", "content": prompt})
+            history = self._touch(session_id)
+            history.append({"role": "user", "content": prompt})
+            messages = list(history)
         else:
             messages = [{"role": "user", "content": prompt}]
 
-        response = self._create_completion(messages, **kwargs)
+        response = self._create_completion(messages, stream, **kwargs)
 
-        if session_id and not self.stream:
-            self.conversation_sessions[session_id].append({
+        if session_id and not stream:
+            history.append({
                 "role": "assistant",
                 "content": response
             })
 
         return response
 
-    def _create_completion(self, messages: List[Dict[str, str]], **kwargs) -> Union[str, Generator[str, None, None]]:
-        """Create a completion using the API."""
-        completion_kwargs = {
-            "model": kwargs.get("model", "gpt-3.5-turbo"),
-            "messages": messages,
-            "temperature": kwargs.get("temperature", 0.7),
-            "max_tokens": kwargs.get("max_tokens", 1024),
-            "top_p": kwargs.get("top_p", 1)
-        }
+    async def agenerate(self, prompt: str, session_id: Optional[str] = None, stream: bool = False, **kwargs) -> Union[str, AsyncGenerator[str, None]]:
+        """
+        Asynchronously generate a response using the language model.
 
-        if self.stream:
-            completion_kwargs["stream"] = self.stream
+        Args:
+            prompt (str): The input prompt.
+            session_id (Optional[str]): The session ID for conversation tracking.
+            stream (bool): Whether to stream the response as it is generated.
+            **kwargs: Additional parameters for the API call. Pass `structured=True`
+                for a deterministic JSON response (JSON mode at temperature 0).
 
-        # Add presence_penalty only if it's provided in kwargs
-        if "presence_penalty" in kwargs:
-            completion_kwargs["presence_penalty"] = kwargs["presence_penalty"]
+        Returns:
+            Union[str, AsyncGenerator[str, None]]: The generated response.
+        """
+        if session_id:
+            history = self._touch(session_id)
+            history.append({"role": "user", "content": prompt})
+            messages = list(history)
+        else:
+            messages = [{"role": "user", "content": prompt}]
 
-        # Add frequency_penalty only if it's provided in kwargs
-        if "frequency_penalty" in kwargs:
-            completion_kwargs["frequency_penalty"] = kwargs["frequency_penalty"]        
+        response = await self._acreate_completion(messages, stream, **kwargs)
 
-        if kwargs.get("json_mode", False):
-            completion_kwargs["response_format"] = {"type": "json_object"}
+        if session_id and not stream:
+            history.append({
+                "role": "assistant",
+                "content": response
+            })
 
-        if kwargs.get("tools"):
-            completion_kwargs["tools"] = kwargs.get("tools")
-            completion_kwargs["tool_choice"] = kwargs.get("tool_choice", "auto")
+        return response
 
-        return self._sync_create_completion(**completion_kwargs)
+    async def abatch(self, prompts: List[str], **kwargs) -> List[Union[str, AsyncGenerator[str, None]]]:
+        """
+        Generate responses for several prompts concurrently.
+
+        Args:
+            prompts (List[str]): The input prompts.
+            **kwargs: Additional parameters passed to `agenerate` for every prompt.
+
+        Returns:
+            List[Union[str, AsyncGenerator[str, None]]]: Responses in the same order as `prompts`.
+        """
+        return await asyncio.gather(*[self.agenerate(prompt, **kwargs) for prompt in prompts])
+
+    def _build_request(self, messages: List[Dict[str, str]], stream: bool = False, **kwargs) -> Tuple[bytes, Optional[str]]:
+        """
+        Serialize the request body for a chat completion.
 
-    def _sync_create_completion(self, **kwargs) -> Union[str, Generator[str, None, None]]:
+        Returns:
+            The JSON body, and the response cache key (None if the response should not be cached).
+        """
+        structured = kwargs.get("structured", False)
+        tools = kwargs.get("tools")
+        template, prefix = _request_template(
+            kwargs.get("model", "gpt-3.5-turbo"),
+            0.0 if structured else kwargs.get("temperature", self.default_temperature),
+            kwargs.get("max_tokens", 1024),
+            kwargs.get("top_p", 1),
+            kwargs.get("presence_penalty"),
+            kwargs.get("frequency_penalty"),
+            structured or kwargs.get("json_mode", False),
+            _json_dumps(tools) if tools else None,
+            _json_dumps(kwargs.get("tool_choice", "auto")) if tools else None,
+            stream
+        )
+        body = prefix + _json_dumps(messages) + b"}"
+        return body, self._response_cache_key(template, body)
+
+    def _create_completion(self, messages: List[Dict[str, str]], stream: bool = False, **kwargs) -> Union[str, Generator[str, None, None]]:
+        """Create a completion using the API."""
+        body, cache_key = self._build_request(messages, stream, **kwargs)
+        return self._sync_create_completion(body, stream, cache_key)
+
+    async def _acreate_completion(self, messages: List[Dict[str, str]], stream: bool = False, **kwargs) -> Union[str, AsyncGenerator[str, None]]:
+        """Asynchronously create a completion using the API."""
+        body, cache_key = self._build_request(messages, stream, **kwargs)
+        return await self._async_create_completion(body, stream, cache_key)
+
+    def _sync_create_completion(self, body: bytes, stream: bool = False, cache_key: Optional[str] = None) -> Union[str, Generator[str, None, None]]:
         """Synchronous completion creation."""
         try:
-            url = f"{self.base_url}/chat/completions"
-            headers = self._get_headers()
-            
-            response = requests.post(url, headers=headers, json=kwargs, stream=self.stream)
+            cached = self._get_cached_response(cache_key)
+            if cached is not None:
+                return self._process_completion_response(cached)
+
+            headers = self._get_headers(stream)
+            response = self._session.post(self._completions_url, headers=headers, data=body, stream=stream)
             response.raise_for_status()
             
-            if self.stream:
+            if stream:
                 return self._process_streaming_response(response)
             else:
-                return self._process_completion_response(response.json())
+                data = _json_loads(response.content)
+                self._cache_response(cache_key, data)
+                return self._process_completion_response(data)
         except requests.RequestException as e:
             raise OpenAIAPIError(f"API request failed: {str(e)}")
         except json.JSONDecodeError as e:
@@ -162,96 +443,270 @@ class OpenAIProvider:
         except Exception as e:
             raise OpenAIAPIError(f"Error in API call: {str(e)}")
 
+    async def _async_create_completion(self, body: bytes, stream: bool = False, cache_key: Optional[str] = None) -> Union[str, AsyncGenerator[str, None]]:
+        """Asynchronous completion creation."""
+        headers = self._get_headers(stream)
+        if stream:
+            return self._async_streaming_completion(self._completions_url, headers, body)
+
+        try:
+            cached = self._get_cached_response(cache_key)
+            if cached is not None:
+                return await self._aprocess_completion_response(cached)
+
+            response = await self._apost(self._completions_url, headers, body)
+            data = _json_loads(response.content)
+            self._cache_response(cache_key, data)
+            return await self._aprocess_completion_response(data)
+        except httpx.HTTPError as e:
+            raise OpenAIAPIError(f"API request failed: {str(e)}")
+        except json.JSONDecodeError as e:
+            raise OpenAIAPIError(f"Failed to parse API response: {str(e)}")
+        except OpenAIAPIError:
+            raise
+        except Exception as e:
+            raise OpenAIAPIError(f"Error in API call: {str(e)}")
+
+    async def _apost(self, url: str, headers: Dict[str, str], body: bytes) -> httpx.Response:
+        """POST with exponential backoff and jitter on transient failures, honouring Retry-After."""
+        retrying = AsyncRetrying(
+            stop=stop_after_attempt(_MAX_RETRIES + 1),
+            wait=_async_retry_wait,
+            retry=retry_if_exception(_is_retryable),
+            reraise=True
+        )
+        async for attempt in retrying:
+            with attempt:
+                response = await self._get_async_client().post(url, headers=headers, content=body)
+                response.raise_for_status()
+        return response
+
+    def _response_cache_key(self, template: Mapping[str, Any], body: bytes) -> Optional[str]:
+        """
+        Return the cache key for a request body, or None if its response should not be cached.
+
+        Only deterministic, non-streaming requests are cached. The key includes the cache
+        generation, so responses stored before `set_api_key`/`set_base_url` are never served.
+        """
+        if not self._response_cache_size or template.get("stream") or template["temperature"] != 0:
+            return None
+        digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        return f"{self._cache_generation}:{digest}"
+
+    def _get_cached_response(self, cache_key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Look up a cached response and mark it as most recently used."""
+        if cache_key is None:
+            return None
+        cached = self._response_cache.get(cache_key)
+        if cached is not None:
+            self._response_cache.move_to_end(cache_key)
+        return cached
+
+    def _cache_response(self, cache_key: Optional[str], response: Dict[str, Any]):
+        """Store a response, evicting the least recently used entries beyond the cache size."""
+        if cache_key is None:
+            return
+        self._response_cache[cache_key] = response
+        while len(self._response_cache) > self._response_cache_size:
+            self._response_cache.popitem(last=False)
+
+    async def _async_streaming_completion(self, url: str, headers: Dict[str, str], body: bytes) -> AsyncGenerator[str, None]:
+        """Open a streaming request and yield content deltas as they arrive."""
+        try:
+            async with self._get_async_client().stream("POST", url, headers=headers, content=body) as response:
+                response.raise_for_status()
+                decoder = _SSEDecoder()
+                async for chunk in response.aiter_bytes():
+                    for payload in decoder.feed(chunk):
+                        if payload == _SSE_DONE:
+                            return
+                        content = self._parse_stream_payload(payload)
+                        if content:
+                            yield content
+        except httpx.HTTPError as e:
+            raise OpenAIAPIError(f"API request failed: {str(e)}")
+
     def _process_completion_response(self, response: Dict[str, Any]) -> str:
         """Process the completion response from the API."""
-        if not response.get("choices"):
-            raise OpenAIAPIError("Invalid response format: no choices found")
-        
-        choice = response["choices"][0]
-        message = choice.get("message", {})
-        
+        message = self._get_response_message(response)
+
         # Handle function calling
         if message.get("toolCalls"):  # Note the camelCase key
-            results = []
-            messages = []
-            
-            # Process each tool call
-            for tool_call in message["toolCalls"]:  # Note the camelCase key
-                if tool_call["type"] != "function":
-                    continue
-                    
-                function_data = tool_call["function"]
-                function_name = function_data["name"]
-                
-                if function_name in self.tools:
-                    try:
-                        # Parse and execute function
-                        args = json.loads(function_data["arguments"])
-                        result = self.tools[function_name](**args)
-                        
-                        # Add tool call to messages for follow-up completion
-                        messages.extend([
-                            {
-                                "role": "assistant",
-                                "toolCalls": [  # Note the camelCase key
-                                    {
-                                        "id": tool_call["id"],
-                                        "type": "function",
-                                        "function": {
-                                            "name": function_name,
-                                            "arguments": function_data["arguments"]
-                                        }
-                                    }
-                                ]
-                            },
-                            {
-                                "role": "tool",
-                                "toolCallId": tool_call["id"],  # Note the camelCase key
-                                "content": json.dumps(result)
-                            }
-                        ])
-                        
-                    except Exception as e:
-                        logger.error(f"Error executing function {function_name}: {e}")
-                        results.append(str(e))
-                else:
-                    results.append(f"Function {function_name} not found")
-            
+            messages, results = self._run_tool_calls(message["toolCalls"])
+
             # If we have tool results, make another API call with the tool responses
             if messages:
                 #TODO: The following code with hit bad request error
                 final_response = self._create_completion(messages)
                 return final_response
-            
+
             # If there were only errors, return them
             return "\n".join(results) if results else ""
-        
+
         return message.get("content", "")
 
-    def _process_streaming_response(self, response: requests.Response) -> Generator[str, None, None]:
-        """Process streaming response."""
-        for line in response.iter_lines():
-            if not line:
+    async def _aprocess_completion_response(self, response: Dict[str, Any]) -> str:
+        """Process the completion response from the API, awaiting any follow-up call."""
+        message = self._get_response_message(response)
+
+        if message.get("toolCalls"):  # Note the camelCase key
+            messages, results = await self._arun_tool_calls(message["toolCalls"])
+            if messages:
+                return await self._acreate_completion(messages)
+            return "\n".join(results) if results else ""
+
+        return message.get("content", "")
+
+    def _get_response_message(self, response: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the message of the first choice in a completion response."""
+        if not response.get("choices"):
+            raise OpenAIAPIError("Invalid response format: no choices found")
+
+        choice = response["choices"][0]
+        return choice.get("message", {})
+
+    def _run_tool_calls(self, tool_calls: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """
+        Execute registered tools for the given tool calls, running distinct calls concurrently.
+
+        Returns:
+            Tuple of the follow-up messages carrying tool results and the
+            error strings for calls that could not be executed.
+        """
+        calls, keys, results = self._prepare_tool_calls(tool_calls)
+        if len(keys) == 1:
+            outcomes = {keys[0]: self._execute_tool(keys[0])}
+        elif keys:
+            with ThreadPoolExecutor(max_workers=min(len(keys), _MAX_TOOL_WORKERS)) as executor:
+                outcomes = dict(zip(keys, executor.map(self._execute_tool, keys)))
+        else:
+            outcomes = {}
+        return self._build_tool_messages(calls, outcomes, results)
+
+    async def _arun_tool_calls(self, tool_calls: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """Asynchronous variant of `_run_tool_calls` that also awaits coroutine tools."""
+        calls, keys, results = self._prepare_tool_calls(tool_calls)
+        outcomes = await asyncio.gather(*[self._aexecute_tool(key) for key in keys])
+        return self._build_tool_messages(calls, dict(zip(keys, outcomes)), results)
+
+    def _prepare_tool_calls(self, tool_calls: List[Dict[str, Any]]) -> Tuple[List[Tuple[Dict[str, Any], Tuple[str, str]]], List[Tuple[str, str]], List[str]]:
+        """
+        Pair each function tool call with its (name, arguments) key so identical calls run once.
+
+        Returns:
+            Tuple of the (tool call, key) pairs, the distinct keys to execute and
+            error strings for calls to unregistered functions.
+        """
+        calls = []
+        keys = {}
+        results = []
+
+        for tool_call in tool_calls:
+            if tool_call["type"] != "function":
                 continue
-            
-            try:
-                line = line.decode('utf-8')
-                if line.startswith('data: '):
-                    line = line[6:]
-                if line.strip() == '[DONE]':
-                    break
-                    
-                chunk = json.loads(line)
-                if chunk.get("choices"):
-                    delta = chunk["choices"][0].get("delta", {})
-                    if "content" in delta and delta["content"] is not None:
-                        yield delta["content"]
-            except json.JSONDecodeError as e:
-                logger.warning(f"Failed to parse streaming response line: {line}, error: {e}")
+
+            function_data = tool_call["function"]
+            function_name = function_data["name"]
+
+            if function_name not in self.tools:
+                results.append(f"Function {function_name} not found")
                 continue
-            except Exception as e:
-                logger.error(f"Error processing streaming response: {e}")
-                raise OpenAIAPIError(f"Error processing streaming response: {e}")
+
+            key = (function_name, function_data["arguments"])
+            keys[key] = None
+            calls.append((tool_call, key))
+
+        return calls, list(keys), results
+
+    def _execute_tool(self, key: Tuple[str, str]) -> Tuple[bool, Any]:
+        """Parse the arguments and call a registered tool, capturing any error."""
+        function_name, arguments = key
+        try:
+            func, validator = self.tools[function_name]
+            args = _json_loads(arguments)
+            if validator is not None:
+                validator(args)
+            result = func(**args)
+            if asyncio.iscoroutine(result):
+                result = asyncio.run(result)
+            return True, result
+        except Exception as e:
+            logger.error(f"Error executing function {function_name}: {e}")
+            return False, e
+
+    async def _aexecute_tool(self, key: Tuple[str, str]) -> Tuple[bool, Any]:
+        """Await coroutine tools directly and run blocking tools in the default executor."""
+        function_name, arguments = key
+        func, validator = self.tools[function_name]
+        if not asyncio.iscoroutinefunction(func):
+            return await asyncio.get_running_loop().run_in_executor(None, self._execute_tool, key)
+
+        try:
+            args = _json_loads(arguments)
+            if validator is not None:
+                validator(args)
+            return True, await func(**args)
+        except Exception as e:
+            logger.error(f"Error executing function {function_name}: {e}")
+            return False, e
+
+    def _build_tool_messages(self, calls: List[Tuple[Dict[str, Any], Tuple[str, str]]], outcomes: Dict[Tuple[str, str], Tuple[bool, Any]], results: List[str]) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """Build a single assistant message with every executed tool call followed by their results."""
+        executed_calls = []
+        tool_messages = []
+
+        for tool_call, key in calls:
+            ok, value = outcomes[key]
+            if not ok:
+                results.append(str(value))
+                continue
+
+            function_name, arguments = key
+            executed_calls.append({
+                "id": tool_call["id"],
+                "type": "function",
+                "function": {
+                    "name": function_name,
+                    "arguments": arguments
+                }
+            })
+            tool_messages.append({
+                "role": "tool",
+                "toolCallId": tool_call["id"],  # Note the camelCase key
+                "content": _json_dumps(value).decode("utf-8")
+            })
+
+        if not executed_calls:
+            return [], results
+
+        return [{"role": "assistant", "toolCalls": executed_calls}] + tool_messages, results
+
+    def _process_streaming_response(self, response: requests.Response) -> Generator[str, None, None]:
+        """Process streaming response."""
+        decoder = _SSEDecoder()
+        # chunk_size=None yields bytes as they arrive instead of waiting for a full block
+        for chunk in response.iter_content(chunk_size=None):
+            for payload in decoder.feed(chunk):
+                if payload == _SSE_DONE:
+                    return
+                content = self._parse_stream_payload(payload)
+                if content:
+                    yield content
+
+    def _parse_stream_payload(self, payload: bytes) -> Optional[str]:
+        """Return the content delta carried by a single server-sent event payload."""
+        try:
+            chunk = _json_loads(payload)
+            choices = chunk.get("choices")
+            if choices:
+                return choices[0].get("delta", {}).get("content")
+            return None
+        except json.JSONDecodeError as e:
+            logger.warning(f"Failed to parse streaming response payload: {payload!r}, error: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Error processing streaming response: {e}")
+            raise OpenAIAPIError(f"Error processing streaming response: {e}")
 
 if __name__ == "__main__":
     # Function calling
@@ -273,7 +728,14 @@ if __name__ == "__main__":
     #for chunk in response:
     #    print(chunk, end='', flush=True)
 
-    provider.register_tool("get_weather", get_weather)
+    weather_parameters = {
+        "type": "object",
+        "properties": {
+            "location": {"type": "string"}
+        },
+        "required": ["location"]
+    }
+    provider.register_tool("get_weather", get_weather, schema=weather_parameters)
     response = provider.generate(
         "What's the weather in London?",
         tools=[{
@@ -281,13 +743,7 @@ if __name__ == "__main__":
             "function": {
                 "name": "get_weather",
                 "description": "Get weather for a location",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "location": {"type": "string"}
-                    },
-                    "required": ["location"]
-                }
+                "parameters": weather_parameters
             }
         }],
         model=model
@@ -3,18 +3,34 @@ PocketgroqPKE - Procedural Knowledge Extractor for PocketGroq
 """
 
 from .types import Step, Procedure
-from .extractor import ProceduralExtractor
 
 __version__ = '0.1.0'
 __all__ = ['ProceduralExtractor', 'Step', 'Procedure']
 
-# Version compatibility check
-import pkg_resources
-pocketgroq_version = pkg_resources.get_distribution('pocketgroq').version
-if pkg_resources.parse_version(pocketgroq_version) < pkg_resources.parse_version('0.5.5'):
-    import warnings
-    warnings.warn(
-        'PocketgroqPKE requires PocketGroq >= 0.5.5. '
-        f'Found version {pocketgroq_version}. Some features may not work correctly.',
-        RuntimeWarning
-    )
+def _check_pocketgroq_version():
+    """Warn if the installed PocketGroq is older than the supported version."""
+    from importlib.metadata import version, PackageNotFoundError
+    from packaging.version import Version
+
+    try:
+        pocketgroq_version = version('pocketgroq')
+    except PackageNotFoundError:
+        return
+
+    if Version(pocketgroq_version) < Version('0.5.5'):
+        import warnings
+        warnings.warn(
+            'PocketgroqPKE requires PocketGroq >= 0.5.5. '
+            f'Found version {pocketgroq_version}. Some features may not work correctly.',
+            RuntimeWarning
+        )
+
+def __getattr__(name):
+    # Import the extractor (and check the PocketGroq version) on first access,
+    # so importing the package for Step/Procedure alone stays cheap.
+    if name == 'ProceduralExtractor':
+        _check_pocketgroq_version()
+        from .extractor import ProceduralExtractor
+        globals()['ProceduralExtractor'] = ProceduralExtractor
+        return ProceduralExtractor
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,34 +1,234 @@
 """
 Core implementation of procedural knowledge extraction with PDF support and visualization.
 """
+import asyncio
+import functools
+import logging
+import multiprocessing
 import os
 import re
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from importlib.resources import files
+from itertools import repeat, zip_longest
 from pathlib import Path
-from typing import Dict, List, Optional, Union, Any
+from typing import Dict, Iterable, Iterator, List, Optional, Union, Any
 
-import PyPDF2
-import graphviz
+import orjson
 from pocketgroq import GroqProvider
 
+try:
+    import pymupdf
+except ImportError:  # Fall back to the slower pure-Python reader
+    pymupdf = None
+    import PyPDF2
+    from PyPDF2.errors import PdfReadError
+
 from .types import Procedure, Step
 
+logger = logging.getLogger(__name__)
+
+# Rough characters-per-token ratio used to size PDF chunks without a tokenizer
+_CHARS_PER_TOKEN = 4
+
+class _NoStepsError(ValueError):
+    """Raised when an LLM response contains no procedure steps."""
+    pass
+
+# Pattern for title detection
+_HOW_TO = re.compile(r'^[Hh]ow to[^:]+:')
+
+# One line of a line-format response: an optional step number ("1."),
+# then an optional "key: value" field
+_RESPONSE_LINE = re.compile(r'^[^\S\n]*(?P<num>\d+\.)?(?:(?P<key>[^:\n]*):(?P<value>[^\n]*))?', re.M)
+
+class _SafeIdTable(dict):
+    """str.translate table that keeps ASCII letters and digits and maps any other character to '_'."""
+    def __missing__(self, codepoint: int) -> str:
+        self[codepoint] = '_'
+        return '_'
+
+_SAFE_ID_TABLE = _SafeIdTable((c, c) for c in range(128) if chr(c).isalnum())
+
+@functools.lru_cache(maxsize=4096)
+def _safe_id(text: str) -> str:
+    """Convert text to safe ID for RDF."""
+    return text.lower().translate(_SAFE_ID_TABLE)
+
+def _parse_list(text: str) -> List[str]:
+    """
+    Parse comma-separated list from text, handling brackets and whitespace.
+    
+    Items are interned, since the same verbs and equipment recur across steps.
+    """
+    text = text.strip().strip('[]')
+    if not text:
+        return []
+    items = (item.strip() for item in text.split(','))
+    return [sys.intern(item) for item in items if item]
+
+def _set_time_info(step: Step, value: str):
+    """Set a step's time information, treating "null" as absent."""
+    time_info = value.strip()
+    step.time_info = time_info if time_info != "null" else None
+
+def _json_list(value: Any) -> List[str]:
+    """Normalize a JSON list field, also accepting a comma-separated string."""
+    if isinstance(value, str):
+        return _parse_list(value)
+    if not isinstance(value, list):
+        return []
+    items = (str(item).strip() for item in value if item is not None)
+    return [sys.intern(item) for item in items if item]
+
+def _step_from_json(data: Dict[str, Any]) -> Step:
+    """Build a Step from one entry of the JSON "steps" array."""
+    time_info = data.get('time')
+    if time_info is not None:
+        time_info = str(time_info).strip()
+        if not time_info or time_info == "null":
+            time_info = None
+    return Step(
+        text=str(data.get('text') or "").strip(),
+        actions=_json_list(data.get('actions')),
+        direct_objects=_json_list(data.get('direct_objects')),
+        equipment=_json_list(data.get('equipment')),
+        time_info=time_info
+    )
+
+# Setters for each "key: value" field of a step in the LLM response
+_STEP_SETTERS = {
+    'text': lambda step, value: setattr(step, 'text', value.strip()),
+    'actions': lambda step, value: setattr(step, 'actions', _parse_list(value)),
+    'direct_objects': lambda step, value: setattr(step, 'direct_objects', _parse_list(value)),
+    'equipment': lambda step, value: setattr(step, 'equipment', _parse_list(value)),
+    'time': _set_time_info,
+}
+
+# Escapes for text inside double-quoted DOT strings
+_DOT_ESCAPE = str.maketrans({'\\': '\\\\', '"': '\\"', '\n': '\\n'})
+
+def _dot_label(text: str) -> str:
+    """Quote text for use as a DOT label."""
+    return f'"{text.translate(_DOT_ESCAPE)}"'
+
+# Escapes for text inside double-quoted Turtle literals
+_TTL_ESCAPE = str.maketrans({'\\': '\\\\', '"': '\\"', '\n': '\\n', '\r': '\\r'})
+
+def _ttl(text: str) -> str:
+    """Escape text for use inside a Turtle string literal."""
+    return text.translate(_TTL_ESCAPE)
+
+# Below this many pages, handing ranges to worker processes costs more than it saves.
+# Each worker reopens the PDF (~2 ms) and pays ~0.4 ms of IPC, while a page of text
+# costs ~0.13 ms (sparse) to ~0.9 ms (dense) to extract, so two workers break even
+# at roughly 35 sparse pages; 64 leaves headroom.
+_PARALLEL_MIN_PAGES = 64
+
+# Process pool shared by every parallel PDF extraction, created on first use.
+# Disabled for the rest of the process once it breaks.
+_page_pool: Optional[ProcessPoolExecutor] = None
+_page_pool_disabled = False
+_page_pool_lock = threading.Lock()
+
+def _get_page_pool() -> Optional[ProcessPoolExecutor]:
+    """Return the shared page extraction pool, creating it if needed, or None if it is disabled."""
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is None and not _page_pool_disabled:
+            # Spawn rather than fork: the pool is usually started from an executor
+            # thread while the event loop and other threads are running
+            _page_pool = ProcessPoolExecutor(
+                max_workers=os.cpu_count() or 1,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _page_pool
+
+def _disable_page_pool(pool: ProcessPoolExecutor):
+    """
+    Drop a broken shared pool and stop creating new ones.
+    
+    The usual cause is a script without an `if __name__ == "__main__":` guard:
+    every spawned worker re-runs it and fails, so a fresh pool would break too.
+    """
+    global _page_pool, _page_pool_disabled
+    with _page_pool_lock:
+        _page_pool_disabled = True
+        if _page_pool is pool:
+            _page_pool = None
+    pool.shutdown(wait=False)
+
+@functools.lru_cache(maxsize=1)
+def _load_template() -> str:
+    """Read the extraction prompt template once per process."""
+    template = files(__package__) / "templates" / "extraction.txt"
+    if not template.is_file():
+        raise FileNotFoundError(f"Extraction template not found at {template}")
+    return template.read_text(encoding='utf-8')
+
+def _page_text(page: "pymupdf.Page") -> str:
+    """
+    Return the text of a PyMuPDF page, or "" for pages without any text.
+    
+    A page that references no fonts cannot contain text, and checking its
+    resources is far cheaper than parsing the content stream of an
+    image- or drawing-heavy page.
+    """
+    if not page.get_fonts():
+        return ""
+    return page.get_text("text")
+
+def _iter_page_range(pdf_path: Union[str, Path], start: int, stop: int) -> Iterator[str]:
+    """Lazily yield the text of pages [start, stop) of a PDF in this process."""
+    with pymupdf.open(pdf_path) as doc:
+        for i in range(start, stop):
+            yield _page_text(doc.load_page(i))
+
+def _extract_page_range(pdf_path: str, start: int, stop: int) -> List[str]:
+    """Extract the text of pages [start, stop) of a PDF (runs in a worker process)."""
+    # The page count is known, so fill a presized list instead of growing one
+    texts = [None] * (stop - start)
+    with pymupdf.open(pdf_path) as doc:
+        for i in range(start, stop):
+            texts[i - start] = _page_text(doc.load_page(i))
+    return texts
+
 class ProceduralExtractor:
     """
     Extracts structured procedural knowledge from text or PDF using PocketGroq.
     Includes visualization capabilities.
     """
-    def __init__(self, groq_provider: GroqProvider, model: str = "llama3-8b-8192", temperature: float = 0.1):
-        """Initialize extractor with optional model customization."""
+    def __init__(self, groq_provider: GroqProvider, model: str = "llama3-8b-8192", temperature: float = 0.0,
+                 chunk_tokens: int = 4096, parallel: bool = True, chunk_concurrency: int = 4,
+                 json_mode: bool = True):
+        """
+        Initialize extractor with optional model customization.
+
+        Args:
+            groq_provider: PocketGroq provider used for LLM calls
+            model: Model name to use for extraction
+            temperature: Sampling temperature for extraction
+            chunk_tokens: Approximate number of input tokens of PDF text sent per LLM call
+            parallel: Extract the pages of large PDFs in a shared pool of worker
+                processes. The workers are spawned, so scripts using this must guard
+                their entry point with `if __name__ == "__main__":`.
+            chunk_concurrency: Maximum number of chunks of one PDF sent to the LLM at once
+            json_mode: Ask Groq to enforce a JSON response, as the bundled template
+                expects. Set to False when `extraction_prompt` is replaced with a
+                prompt that does not request JSON.
+        """
         self.groq = groq_provider
         self.model = model
         self.temperature = temperature
+        self.chunk_tokens = chunk_tokens
+        self.parallel = parallel
+        self.chunk_concurrency = chunk_concurrency
+        self.json_mode = json_mode
 
         # Load extraction prompt template
-        template_path = Path(__file__).parent / "templates" / "extraction.txt"
-        if not template_path.exists():
-            raise FileNotFoundError(f"Extraction template not found at {template_path}")
-        with open(template_path) as f:
-            self.extraction_prompt = f.read()
+        self.extraction_prompt = _load_template()
 
     def extract_text_from_pdf(self, pdf_path: Union[str, Path]) -> str:
         """
@@ -42,23 +242,99 @@ class ProceduralExtractor:
             
         Raises:
             FileNotFoundError: If PDF file not found
-            PyPDF2.PdfReadError: If PDF is corrupted or unreadable
+            pymupdf.FileDataError: If PDF is corrupted or unreadable
+                (PyPDF2.errors.PdfReadError when using the PyPDF2 fallback)
+        """
+        return "\n".join(self.iter_pdf_pages(pdf_path))
+
+    def iter_pdf_pages(self, pdf_path: Union[str, Path]) -> Iterator[str]:
+        """
+        Lazily yield the text of each page of a PDF file.
+        
+        Pages without any text (such as scanned images) yield an empty string.
+        Uses PyMuPDF when it is installed and falls back to PyPDF2 otherwise.
+        
+        Args:
+            pdf_path: Path to PDF file
+            
+        Yields:
+            Text content of each page, in order
+            
+        Raises:
+            FileNotFoundError: If PDF file not found
+            pymupdf.FileDataError: If PDF is corrupted or unreadable
+                (PyPDF2.errors.PdfReadError when using the PyPDF2 fallback)
         """
         pdf_path = Path(pdf_path)
         if not pdf_path.exists():
             raise FileNotFoundError(f"PDF file not found: {pdf_path}")
             
+        if pymupdf is None:
+            yield from self._iter_pages_with_pypdf2(pdf_path)
+            return
+            
+        try:
+            with pymupdf.open(pdf_path) as doc:
+                page_count = doc.page_count
+                workers = min(os.cpu_count() or 1, page_count)
+                if not self.parallel or page_count < _PARALLEL_MIN_PAGES or workers < 2:
+                    for i in range(page_count):
+                        yield _page_text(doc.load_page(i))
+                    return
+                
+        except pymupdf.FileDataError as e:
+            raise pymupdf.FileDataError(f"Failed to read PDF {pdf_path}: {str(e)}")
+            
+        # Split the pages into one contiguous range per worker, preserving order
+        step = -(-page_count // workers)
+        starts = range(0, page_count, step)
+        stops = [min(start + step, page_count) for start in starts]
+        pool = _get_page_pool()
+        done = 0
+        if pool is not None:
+            try:
+                for texts in pool.map(_extract_page_range, repeat(str(pdf_path)), starts, stops):
+                    yield from texts
+                    done += len(texts)
+                return
+            except BrokenProcessPool:
+                _disable_page_pool(pool)
+                logger.warning(
+                    f"PDF worker processes failed while reading {pdf_path}; extracting pages "
+                    f"{done + 1}-{page_count} sequentially and disabling parallel extraction. "
+                    'Guard your script with `if __name__ == "__main__":` to use parallel extraction.'
+                )
+                
+        # Pool unavailable: finish from the first page not yet yielded
+        yield from _iter_page_range(pdf_path, done, page_count)
+
+    def _iter_pages_with_pypdf2(self, pdf_path: Path) -> Iterator[str]:
+        """Lazily yield the text of each page of a PDF file using PyPDF2."""
         try:
-            text_content = []
             with open(pdf_path, 'rb') as file:
                 reader = PyPDF2.PdfReader(file)
                 for page in reader.pages:
-                    text_content.append(page.extract_text())
-                    
-            return "\n".join(text_content)
+                    yield page.extract_text()
             
-        except PyPDF2.PdfReadError as e:
-            raise PyPDF2.PdfReadError(f"Failed to read PDF {pdf_path}: {str(e)}")
+        except PdfReadError as e:
+            raise PdfReadError(f"Failed to read PDF {pdf_path}: {str(e)}")
+
+    def _chunk_pages(self, pages: Iterable[str]) -> Iterator[str]:
+        """Group consecutive pages into chunks of roughly `chunk_tokens` tokens."""
+        budget = self.chunk_tokens * _CHARS_PER_TOKEN
+        chunk = []
+        size = 0
+        for page in pages:
+            if not page:
+                continue
+            if chunk and size + len(page) > budget:
+                yield "\n".join(chunk)
+                chunk = []
+                size = 0
+            chunk.append(page)
+            size += len(page) + 1
+        if chunk:
+            yield "\n".join(chunk)
 
     async def extract_procedure_from_file(self, file_path: Union[str, Path]) -> Procedure:
         """
@@ -79,15 +355,84 @@ class ProceduralExtractor:
             raise FileNotFoundError(f"File not found: {file_path}")
             
         if file_path.suffix.lower() == '.pdf':
-            text = self.extract_text_from_pdf(file_path)
+            return await self._extract_procedure_from_pdf(file_path)
         elif file_path.suffix.lower() == '.txt':
-            with open(file_path, 'r', encoding='utf-8') as f:
-                text = f.read()
+            # Read in a worker thread so other extractions keep running
+            text = await asyncio.to_thread(file_path.read_text, encoding='utf-8')
         else:
             raise ValueError(f"Unsupported file type: {file_path.suffix}")
             
         return await self.extract_procedure(text)
 
+    async def extract_procedures(self, file_paths: Iterable[Union[str, Path]], concurrency: int = 16) -> List[Procedure]:
+        """
+        Extract procedures from several text or PDF files concurrently.
+        
+        Args:
+            file_paths: Paths to input files (.txt or .pdf)
+            concurrency: Maximum number of files processed at once. Lower it
+                if requests start hitting your Groq rate limit.
+            
+        Returns:
+            Extracted Procedure objects, in the same order as `file_paths`
+            
+        Raises:
+            ValueError: If a file type is not supported
+            FileNotFoundError: If a file is not found
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def extract_one(file_path: Union[str, Path]) -> Procedure:
+            async with semaphore:
+                return await self.extract_procedure_from_file(file_path)
+                
+        return await asyncio.gather(*[extract_one(file_path) for file_path in file_paths])
+
+    async def _extract_procedure_from_pdf(self, pdf_path: Path) -> Procedure:
+        """
+        Extract a procedure from a PDF, sending page chunks to the LLM concurrently.
+        
+        Chunks whose response contains no steps are skipped. Any other chunk failure
+        (rate limits, network errors, ...) is logged and re-raised once all chunks have
+        finished, so a partial procedure is never returned as if it were complete.
+        """
+        # Page extraction is blocking, so keep it off the event loop
+        chunks = await asyncio.to_thread(
+            lambda: [chunk for chunk in self._chunk_pages(self.iter_pdf_pages(pdf_path)) if chunk.strip()]
+        )
+        if not chunks:
+            raise ValueError(f"No text found in PDF: {pdf_path}")
+            
+        semaphore = asyncio.Semaphore(self.chunk_concurrency)
+        
+        async def extract_chunk(chunk: str) -> Procedure:
+            async with semaphore:
+                return await self.extract_procedure(chunk)
+                
+        results = await asyncio.gather(*[extract_chunk(chunk) for chunk in chunks], return_exceptions=True)
+        
+        procedures = []
+        failure = None
+        for i, result in enumerate(results, 1):
+            if isinstance(result, Procedure):
+                procedures.append(result)
+            elif isinstance(result, _NoStepsError):
+                logger.debug(f"No steps found in chunk {i}/{len(chunks)} of {pdf_path}")
+            else:
+                logger.warning(f"Extraction of chunk {i}/{len(chunks)} of {pdf_path} failed: {result}")
+                if failure is None:
+                    failure = result
+                    
+        if failure is not None:
+            raise failure
+        if not procedures:
+            raise _NoStepsError(f"Failed to extract any procedure steps from {pdf_path}")
+            
+        return Procedure(
+            title=procedures[0].title,
+            steps=[step for procedure in procedures for step in procedure.steps]
+        )
+
     def visualize(self, procedure: Procedure, output_path: Union[str, Path, None] = None) -> Path:
         """
         Create a graphical visualization of the procedure.
@@ -101,53 +446,67 @@ class ProceduralExtractor:
             Path to generated visualization file
             
         Raises:
+            ImportError: If the graphviz package is not installed
             OSError: If file cannot be written
             graphviz.ExecutableNotFound: If Graphviz is not installed
         """
-        # Create graph
-        dot = graphviz.Digraph(comment=procedure.title)
-        dot.attr(rankdir='TB')  # Top to bottom layout
-        
-        # Add procedure node
+        # Imported here so the package loads without the optional viz extra
+        try:
+            import graphviz
+        except ImportError:
+            raise ImportError(
+                "visualize() requires the graphviz package. "
+                "Install it with: pip install pocketgroq_pke[viz]"
+            )
+            
+        # Build the DOT source directly; one string join is much cheaper than
+        # a graphviz.Digraph method call per node and edge on large procedures
         proc_id = self._safe_id(procedure.title)
-        dot.node(proc_id, procedure.title, shape='box', style='filled', fillcolor='lightblue')
+        step_ids = [f"{proc_id}_step{i+1}" for i in range(len(procedure.steps))]
+        lines = [
+            'digraph {',
+            '\trankdir=TB',  # Top to bottom layout
+            f'\t"{proc_id}" [label={_dot_label(procedure.title)} fillcolor=lightblue shape=box style=filled]'
+        ]
         
         # Add steps with their components
-        prev_step = None
-        for i, step in enumerate(procedure.steps):
-            step_id = f"{proc_id}_step{i+1}"
-            
+        for i, (step, step_id) in enumerate(zip(procedure.steps, step_ids)):
             # Step node
-            dot.node(step_id, step.text, shape='box')
-            dot.edge(proc_id, step_id)
+            lines.append(f'\t"{step_id}" [label={_dot_label(step.text)} shape=box]')
+            lines.append(f'\t"{proc_id}" -> "{step_id}"')
             
             # Link to previous step
-            if prev_step:
-                dot.edge(prev_step, step_id, dir='forward')
+            if i:
+                lines.append(f'\t"{step_ids[i - 1]}" -> "{step_id}" [dir=forward]')
                 
             # Add actions, objects and equipment
-            for j, action in enumerate(step.actions):
-                action_id = f"{step_id}_action{j}"
-                dot.node(action_id, action, shape='ellipse', style='filled', fillcolor='lightgreen')
-                dot.edge(step_id, action_id)
-                
-                # Link action to direct object if available
-                if j < len(step.direct_objects):
-                    obj_id = f"{step_id}_obj{j}"
-                    dot.node(obj_id, step.direct_objects[j], shape='diamond')
-                    dot.edge(action_id, obj_id)
+            if step.actions or step.direct_objects:
+                for j, (action, obj) in enumerate(zip_longest(step.actions, step.direct_objects)):
+                    # An object without a matching action hangs off the step
+                    parent_id = step_id
+                    if action is not None:
+                        parent_id = f"{step_id}_action{j}"
+                        lines.append(f'\t"{parent_id}" [label={_dot_label(action)} fillcolor=lightgreen shape=ellipse style=filled]')
+                        lines.append(f'\t"{step_id}" -> "{parent_id}"')
+                    
+                    # Link action to direct object if available
+                    if obj is not None:
+                        obj_id = f"{step_id}_obj{j}"
+                        lines.append(f'\t"{obj_id}" [label={_dot_label(obj)} shape=diamond]')
+                        lines.append(f'\t"{parent_id}" -> "{obj_id}"')
                     
             # Add equipment
             for j, equip in enumerate(step.equipment):
                 equip_id = f"{step_id}_equip{j}"
-                dot.node(equip_id, equip, shape='hexagon', style='filled', fillcolor='lightyellow')
-                dot.edge(step_id, equip_id)
+                lines.append(f'\t"{equip_id}" [label={_dot_label(equip)} fillcolor=lightyellow shape=hexagon style=filled]')
+                lines.append(f'\t"{step_id}" -> "{equip_id}"')
                 
-            prev_step = step_id
+        lines.append('}')
+        dot = graphviz.Source("\n".join(lines))
 
         # Handle output path
         if not output_path:
-            output_path = Path(f"{self._safe_id(procedure.title)}.pdf")
+            output_path = Path(f"{proc_id}.pdf")
         else:
             output_path = Path(output_path)
             if not output_path.suffix:
@@ -167,12 +526,12 @@ class ProceduralExtractor:
     def _extract_title_from_text(self, text: str) -> str:
         """Extract title from input text."""
         # Try to find "How to" format
-        how_to_match = re.match(r'^[Hh]ow to[^:]+:', text)
+        how_to_match = _HOW_TO.match(text)
         if how_to_match:
             return how_to_match.group(0).rstrip(':').strip()
         
         # Try first line ending in colon
-        first_line = text.split('\n')[0].strip()
+        first_line = text.partition('\n')[0].strip()
         if first_line.endswith(':'):
             return first_line.rstrip(':').strip()
             
@@ -199,12 +558,10 @@ class ProceduralExtractor:
         # Pre-extract title for prompt
         title = self._extract_title_from_text(text)
             
-        # Prepare extraction prompt
-        prompt = (
-            self.extraction_prompt + 
-            f"\nTitle: {title}\n\n" +
-            "Text to analyze:\n" + text
-        )
+        # Prepare extraction prompt. The template must stay a byte-identical prefix
+        # with everything call-specific after it, so providers that cache prompt
+        # prefixes can reuse it across calls.
+        prompt = f"{self.extraction_prompt}\nTitle: {title}\n\nText to analyze:\n{text}"
         
         try:
             # Get LLM extraction
@@ -213,40 +570,65 @@ class ProceduralExtractor:
                 model=self.model,
                 temperature=self.temperature,
                 max_tokens=2048,
-                async_mode=True
+                async_mode=True,
+                json_mode=self.json_mode
             )
             
             # Parse into structured format
             procedure = self._parse_extraction_response(response, fallback_title=title)
             return procedure
             
+        except ValueError:
+            raise
         except Exception as e:
             raise Exception(f"Extraction failed: {str(e)}")
 
     def _parse_extraction_response(self, response: str, fallback_title: str = "") -> Procedure:
-        """Parse LLM response into structured Procedure object."""
-        lines = response.strip().split('\n')
+        """
+        Parse LLM response into structured Procedure object.
         
-        # Get title
+        Expects the JSON object requested by the extraction template, and falls
+        back to the older line format for responses that are not valid JSON.
+        """
+        # Take the outermost braces, which also drops any code fence around the JSON
+        start = response.find('{')
+        end = response.rfind('}')
+        if start != -1 and end > start:
+            try:
+                data = orjson.loads(response[start:end + 1])
+            except orjson.JSONDecodeError:
+                data = None
+            if isinstance(data, dict):
+                return self._parse_json_response(data, fallback_title)
+                
+        return self._parse_line_response(response, fallback_title)
+        
+    def _parse_json_response(self, data: Dict[str, Any], fallback_title: str = "") -> Procedure:
+        """Build a Procedure from a decoded JSON extraction response."""
+        steps = data.get('steps')
+        if not isinstance(steps, list):
+            steps = []
+        steps = [_step_from_json(step) for step in steps if isinstance(step, dict)]
+        if not steps:
+            raise _NoStepsError("Failed to extract any procedure steps")
+            
+        title = data.get('title')
+        title = str(title).strip() if title is not None else ""
+        return Procedure(title=title or fallback_title, steps=steps)
+        
+    def _parse_line_response(self, response: str, fallback_title: str = "") -> Procedure:
+        """Parse a line-format LLM response into a Procedure in a single pass."""
         title = fallback_title  # Use fallback by default
-        for line in lines:
-            if line.startswith('title:'):
-                extracted_title = line.split(':', 1)[1].strip()
-                if extracted_title:  # Only use if non-empty
-                    title = extracted_title
-                break
-
-        # Extract steps
+        title_found = False
         steps = []
         current_step = None
         
-        for line in lines:
-            line = line.strip()
+        # A single regex scan splits every line into step number, key and value
+        for match in _RESPONSE_LINE.finditer(response):
+            num, key, value = match.group('num', 'key', 'value')
             
-            # New step starts with number
-            if re.match(r'^\d+\.', line):
-                if current_step:
-                    steps.append(current_step)
+            # New step starts with number; its first field may follow on the same line
+            if num:
                 current_step = Step(
                     text="",
                     actions=[],
@@ -254,38 +636,28 @@ class ProceduralExtractor:
                     equipment=[],
                     time_info=None
                 )
+                steps.append(current_step)
                 
-            if not current_step:
+            if key is None:
                 continue
-                
-            # Parse step components
-            if 'text:' in line:
-                current_step.text = line.split(':', 1)[1].strip()
-            elif 'actions:' in line:
-                current_step.actions = self._parse_list(line.split(':', 1)[1])
-            elif 'direct_objects:' in line:
-                current_step.direct_objects = self._parse_list(line.split(':', 1)[1])
-            elif 'equipment:' in line:
-                current_step.equipment = self._parse_list(line.split(':', 1)[1]) 
-            elif 'time:' in line:
-                time_info = line.split(':', 1)[1].strip()
-                current_step.time_info = time_info if time_info != "null" else None
-                
-        # Add final step
-        if current_step:
-            steps.append(current_step)
+            key = key.strip(' -*').lower()
             
+            if key == 'title':
+                # Only the first title line counts, and only if non-empty
+                if not title_found:
+                    title_found = True
+                    value = value.strip()
+                    if value:
+                        title = value
+            elif current_step is not None:
+                setter = _STEP_SETTERS.get(key)
+                if setter:
+                    setter(current_step, value)
+                    
         if not steps:
-            raise ValueError("Failed to extract any procedure steps")
+            raise _NoStepsError("Failed to extract any procedure steps")
             
         return Procedure(title=title, steps=steps)
-
-    def _parse_list(self, text: str) -> List[str]:
-        """Parse comma-separated list from text, handling brackets and whitespace."""
-        text = text.strip().strip('[]')
-        if not text:
-            return []
-        return [item.strip() for item in text.split(',') if item.strip()]
         
     def generate_kg(self, procedure: Procedure) -> str:
         """
@@ -298,7 +670,7 @@ class ProceduralExtractor:
             String containing RDF in Turtle format
         """
         # Base prefix definitions
-        turtle = """
+        parts = ["""
         @prefix p-plan: <http://purl.org/net/p-plan#> .
         @prefix khub-proc: <https://knowledge.c-innovationhub.com/k-hub/procedure#> .
         @prefix frapo: <http://purl.org/cerif/frapo/> .
@@ -306,61 +678,56 @@ class ProceduralExtractor:
         @prefix po: <http://example.org/procedural#> .
         @prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
         
-        """
+        """]
         
         # Create procedure
         proc_id = self._safe_id(procedure.title)
-        turtle += f"""
+        step_ids = [f"{proc_id}_step{i+1}" for i in range(len(procedure.steps))]
+        parts.append(f"""
         :{proc_id} a p-plan:Plan ;
-            rdfs:label "{procedure.title}" .
-        """
+            rdfs:label "{_ttl(procedure.title)}" .
+        """)
         
         # Add steps
-        prev_step = None
-        for i, step in enumerate(procedure.steps):
-            step_id = f"{proc_id}_step{i+1}"
-            
+        for i, (step, step_id) in enumerate(zip(procedure.steps, step_ids)):
             # Basic step info
-            turtle += f"""
+            parts.append(f"""
             :{step_id} a p-plan:Step ;
-                rdfs:label "{step.text}" ;
-            """
+                rdfs:label "{_ttl(step.text)}" ;
+            """)
             
             # Link to procedure
-            turtle += f"    po:hasStep :{proc_id} ;\n"
+            parts.append(f"    po:hasStep :{proc_id} ;\n")
             
-            # Add actions and objects
-            for j, (action, obj) in enumerate(zip(step.actions, step.direct_objects)):
-                action_id = f"{step_id}_action{j+1}"
-                obj_id = f"{step_id}_obj{j+1}"
-                
-                turtle += f"""
-                po:hasAction :{action_id} ;
-                po:hasDirectObjectOfAction :{obj_id} ;
-                """
+            # Add actions and objects; zip_longest keeps the extras when the
+            # two lists differ in length instead of silently dropping them
+            if step.actions or step.direct_objects:
+                for j, (action, obj) in enumerate(zip_longest(step.actions, step.direct_objects), 1):
+                    if action is not None:
+                        parts.append(f"\n                po:hasAction :{step_id}_action{j} ;")
+                    if obj is not None:
+                        parts.append(f"\n                po:hasDirectObjectOfAction :{step_id}_obj{j} ;")
+                    parts.append("\n                ")
                 
             # Add equipment
-            for j, equip in enumerate(step.equipment):
-                equip_id = f"{step_id}_equip{j+1}"
-                turtle += f"    frapo:usesEquipment :{equip_id} ;\n"
+            if step.equipment:
+                parts.extend(f"    frapo:usesEquipment :{step_id}_equip{j+1} ;\n" for j in range(len(step.equipment)))
                 
             # Add time info if present    
             if step.time_info:
-                time_id = f"{step_id}_time"
-                turtle += f"    time:hasTime :{time_id} ;\n"
+                parts.append(f"    time:hasTime :{step_id}_time ;\n")
                 
             # Link to previous step
-            if prev_step:
-                turtle += f"    p-plan:precededBy :{prev_step} ;\n"
+            if i:
+                parts.append(f"    p-plan:precededBy :{step_ids[i - 1]} ;\n")
                 
-            turtle += "    .\n"
-            prev_step = step_id
+            parts.append("    .\n")
             
-        return turtle
+        return "".join(parts)
 
     def _safe_id(self, text: str) -> str:
         """Convert text to safe ID for RDF."""
-        return re.sub(r'[^a-zA-Z0-9]', '_', text.lower())
+        return _safe_id(text)
 
     def save_kg(self, procedure: Procedure, filepath: Union[str, Path, None] = None) -> Path:
         """
@@ -413,4 +780,22 @@ class ProceduralExtractor:
         except OSError as e:
             raise OSError(f"Failed to save knowledge graph to {target_path}: {str(e)}")
         except Exception as e:
-            raise Exception(f"Error generating knowledge graph: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Error generating knowledge graph: {str(e)}")
+
+    async def asave_kg(self, procedure: Procedure, filepath: Union[str, Path, None] = None) -> Path:
+        """
+        Async version of `save_kg` that writes the file in a worker thread.
+        
+        Args:
+            procedure: Extracted procedure to convert to RDF
+            filepath: Optional path where to save the file. If not provided,
+                     will generate filename from procedure title.
+        
+        Returns:
+            Path object pointing to saved file
+        
+        Raises:
+            OSError: If file cannot be written
+            Exception: For other errors during RDF generation
+        """
+        return await asyncio.to_thread(self.save_kg, procedure, filepath)
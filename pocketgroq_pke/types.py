@@ -4,7 +4,7 @@ Data classes for procedural knowledge extraction.
 from dataclasses import dataclass
 from typing import List, Optional
 
-@dataclass
+@dataclass(slots=True)
 class Step:
     """
     Represents a single step in a procedure.
@@ -22,7 +22,7 @@ class Step:
     equipment: List[str]
     time_info: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True)
 class Procedure:
     """
     Represents a complete procedure with sequential steps.
@@ -21,23 +21,29 @@ setup(
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.7",
-        "Programming Language :: Python :: 3.8",
-        "Programming Language :: Python :: 3.9",
         "Programming Language :: Python :: 3.10",
         "Programming Language :: Python :: 3.11",
+        "Programming Language :: Python :: 3.12",
     ],
-    python_requires=">=3.7",
+    python_requires=">=3.10",
     install_requires=[
         "pocketgroq>=0.5.5",
-        "rdflib>=6.0.0",
-        "python-dotenv>=0.19.1",
+        "packaging>=20.0",
         "groq>=0.8.0",
-        "markdown2>=2.5.0",
-        "PyPDF2>=3.0.0",
-        "graphviz>=0.20.1"
+        "orjson>=3.8.0",
+        "pymupdf>=1.24.3"
     ],
     extras_require={
+        'viz': ['graphviz>=0.20.1'],
+        'rdf': ['rdflib>=6.0.0'],
+        'markdown': ['markdown2>=2.5.0'],
+        'dotenv': ['python-dotenv>=0.19.1'],
+        'all': [
+            'graphviz>=0.20.1',
+            'rdflib>=6.0.0',
+            'markdown2>=2.5.0',
+            'python-dotenv>=0.19.1'
+        ],
         'dev': [
             'pytest>=7.3.1',
             'pytest-asyncio>=0.21.0'
@@ -0,0 +1,97 @@
+"""
+Regression tests for parsing LLM extraction responses into Procedure objects.
+"""
+import pytest
+
+pytest.importorskip("pocketgroq")
+
+from pocketgroq_pke import Procedure, Step
+from pocketgroq_pke.extractor import ProceduralExtractor
+
+# A response in the line format of the original extraction template
+LINE_RESPONSE = """title: Make coffee
+steps:
+1. text: Fill kettle with water and boil
+   actions: [fill, boil]
+   direct_objects: [kettle, water]
+   equipment: [kettle, stove]
+   time: null
+2. text: Steep the coffee
+   actions: steep
+   direct_objects: coffee
+   equipment: french press
+   time: 4 minutes
+"""
+
+EXPECTED = Procedure(
+    title="Make coffee",
+    steps=[
+        Step(
+            text="Fill kettle with water and boil",
+            actions=["fill", "boil"],
+            direct_objects=["kettle", "water"],
+            equipment=["kettle", "stove"],
+            time_info=None
+        ),
+        Step(
+            text="Steep the coffee",
+            actions=["steep"],
+            direct_objects=["coffee"],
+            equipment=["french press"],
+            time_info="4 minutes"
+        ),
+    ]
+)
+
+@pytest.fixture
+def extractor():
+    return ProceduralExtractor(groq_provider=None)
+
+def test_template_line_format(extractor):
+    assert extractor._parse_extraction_response(LINE_RESPONSE, fallback_title="fallback") == EXPECTED
+
+def test_crlf_line_endings(extractor):
+    response = LINE_RESPONSE.replace("\n", "\r\n")
+    assert extractor._parse_extraction_response(response, fallback_title="fallback") == EXPECTED
+
+def test_values_containing_colons(extractor):
+    response = (
+        "title: How to: brew coffee\n"
+        "1. text: Note: use fresh beans\n"
+        "   time: 10:30 a.m.\n"
+    )
+    procedure = extractor._parse_extraction_response(response)
+    assert procedure.title == "How to: brew coffee"
+    assert procedure.steps[0].text == "Note: use fresh beans"
+    assert procedure.steps[0].time_info == "10:30 a.m."
+
+def test_markdown_bullets_and_case(extractor):
+    response = (
+        "**Title**: Make tea\n"
+        "1.\n"
+        "- **Text**: Boil water\n"
+        "- Actions: boil\n"
+    )
+    procedure = extractor._parse_extraction_response(response)
+    assert procedure.title == "Make tea"
+    assert procedure.steps == [Step(text="Boil water", actions=["boil"], direct_objects=[], equipment=[])]
+
+def test_only_first_title_counts(extractor):
+    response = "title:\ntitle: Second\n1. text: a\n"
+    assert extractor._parse_extraction_response(response, fallback_title="fallback").title == "fallback"
+
+def test_no_steps_raises(extractor):
+    with pytest.raises(ValueError):
+        extractor._parse_extraction_response("title: Nothing here\n")
+
+def test_json_in_code_fence(extractor):
+    response = (
+        "```json\n"
+        '{"title": "Make coffee", "steps": ['
+        '{"text": "Fill kettle with water and boil", "actions": ["fill", "boil"], '
+        '"direct_objects": ["kettle", "water"], "equipment": ["kettle", "stove"], "time": null}, '
+        '{"text": "Steep the coffee", "actions": "steep", "direct_objects": ["coffee"], '
+        '"equipment": ["french press"], "time": "4 minutes"}]}\n'
+        "```"
+    )
+    assert extractor._parse_extraction_response(response) == EXPECTED
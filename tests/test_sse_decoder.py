@@ -0,0 +1,58 @@
+"""
+Tests for the incremental server-sent event decoder used by OpenAIProvider streaming.
+"""
+import pytest
+
+from openai_provider import _SSEDecoder
+
+STREAM = (
+    b'data: {"choices":[{"delta":{"content":"Hel"}}]}\n\n'
+    b': keep-alive\n\n'
+    b'data:{"choices":[{"delta":{"content":"lo"}}]}\n\n'
+    b'data: [DONE]\n\n'
+)
+
+PAYLOADS = [
+    b'{"choices":[{"delta":{"content":"Hel"}}]}',
+    b'{"choices":[{"delta":{"content":"lo"}}]}',
+    b'[DONE]',
+]
+
+def feed_all(chunks):
+    """Feed chunks to a fresh decoder and collect every payload it returns."""
+    decoder = _SSEDecoder()
+    payloads = []
+    for chunk in chunks:
+        payloads.extend(decoder.feed(chunk))
+    return payloads
+
+def split_every(data: bytes, size: int):
+    """Split data into chunks of at most `size` bytes."""
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+def test_single_chunk():
+    assert feed_all([STREAM]) == PAYLOADS
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 7, 16])
+def test_events_split_across_chunks(size):
+    assert feed_all(split_every(STREAM, size)) == PAYLOADS
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 7, 16])
+def test_crlf_line_endings(size):
+    stream = STREAM.replace(b"\n", b"\r\n")
+    assert feed_all(split_every(stream, size)) == PAYLOADS
+
+def test_crlf_split_between_cr_and_lf():
+    assert feed_all([b"data: a\r", b"\n\r", b"\ndata: [DONE]\r\n", b"\r\n"]) == [b"a", b"[DONE]"]
+
+def test_data_with_and_without_space():
+    assert feed_all([b"data: spaced\n\ndata:tight\n\n"]) == [b"spaced", b"tight"]
+
+def test_non_data_fields_are_ignored():
+    assert feed_all([b"event: message\nid: 1\ndata: x\nretry: 10\n\n"]) == [b"x"]
+
+def test_incomplete_event_is_held_back():
+    decoder = _SSEDecoder()
+    assert decoder.feed(b"data: [DONE]\n") == []
+    assert decoder.feed(b"\n") == [b"[DONE]"]
+    assert decoder.feed(b"") == []